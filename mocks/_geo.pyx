@@ -0,0 +1,102 @@
+# cython: language_level=3, boundscheck=False, wraparound=False, cdivision=True
+# distutils: extra_compile_args = -O3 -ffast-math -fopenmp-simd
+# distutils: libraries = m
+"""
+CanaSwarm-MicroBot - Geo Kernels (Cython)
+
+Versão compilada dos kernels em lote de distância/bearing (equirretangular).
+Compilar com: cythonize -i _geo.pyx
+Build só para a CPU local (não distribuir): CFLAGS=-march=native cythonize -i _geo.pyx
+"""
+
+cimport cython
+from libc.math cimport atan2, fmod, hypot, M_PI
+
+import numpy as np
+
+cdef double EARTH_RADIUS_M = 6371000.0
+cdef double DEG_TO_RAD = M_PI / 180.0
+cdef double RAD_TO_DEG = 180.0 / M_PI
+
+
+cdef inline void _equirect_offset(double lat1, double lon1, double lat2, double lon2,
+                                  double cos_lat_ref, double* dx, double* dy) noexcept nogil:
+    dx[0] = EARTH_RADIUS_M * cos_lat_ref * DEG_TO_RAD * (lon2 - lon1)
+    dy[0] = EARTH_RADIUS_M * DEG_TO_RAD * (lat2 - lat1)
+
+
+cdef void _equirect_bearing_batch(const double* lat, const double* lon, Py_ssize_t n,
+                                  double cos_lat_ref, double* dist_out,
+                                  double* brg_out) noexcept nogil:
+    cdef double dx, dy
+    cdef Py_ssize_t i
+
+    for i in range(n - 1):
+        _equirect_offset(lat[i], lon[i], lat[i + 1], lon[i + 1], cos_lat_ref, &dx, &dy)
+        dist_out[i] = hypot(dx, dy)
+        brg_out[i] = fmod(atan2(dx, dy) * RAD_TO_DEG + 360.0, 360.0)
+
+
+cdef void _equirect_distance_batch(const double* lat, const double* lon, Py_ssize_t n,
+                                   double cos_lat_ref, double* dist_out) noexcept nogil:
+    cdef double dx, dy
+    cdef Py_ssize_t i
+
+    for i in range(n - 1):
+        _equirect_offset(lat[i], lon[i], lat[i + 1], lon[i + 1], cos_lat_ref, &dx, &dy)
+        dist_out[i] = hypot(dx, dy)
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.cdivision(True)
+cpdef tuple equirect_bearing_batch(const double[::1] lats, const double[::1] lons,
+                                   double cos_lat_ref):
+    """
+    Distâncias e bearings de todos os segmentos consecutivos de uma rota
+
+    Args:
+        lats: Latitudes em graus (float64 contíguo, n pontos)
+        lons: Longitudes em graus (float64 contíguo, n pontos)
+        cos_lat_ref: Cosseno da latitude de referência da missão
+
+    Returns:
+        (distâncias em metros, bearings em graus), cada um com n-1 segmentos
+    """
+    cdef Py_ssize_t n = lats.shape[0]
+    if lons.shape[0] != n:
+        raise ValueError("lats e lons devem ter o mesmo tamanho")
+    if n < 2:
+        return np.empty(0), np.empty(0)
+
+    distances = np.empty(n - 1)
+    bearings = np.empty(n - 1)
+    cdef double[::1] dist_view = distances
+    cdef double[::1] brg_view = bearings
+
+    with nogil:
+        _equirect_bearing_batch(&lats[0], &lons[0], n, cos_lat_ref,
+                                &dist_view[0], &brg_view[0])
+
+    return distances, bearings
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.cdivision(True)
+cpdef equirect_distance_batch(const double[::1] lats, const double[::1] lons,
+                              double cos_lat_ref):
+    """Só as distâncias (m) dos segmentos, sem o atan2 do bearing"""
+    cdef Py_ssize_t n = lats.shape[0]
+    if lons.shape[0] != n:
+        raise ValueError("lats e lons devem ter o mesmo tamanho")
+    if n < 2:
+        return np.empty(0)
+
+    distances = np.empty(n - 1)
+    cdef double[::1] dist_view = distances
+
+    with nogil:
+        _equirect_distance_batch(&lats[0], &lons[0], n, cos_lat_ref, &dist_view[0])
+
+    return distances
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+CanaSwarm-MicroBot - Utilitários compartilhados pelos mocks
+
+Carregamento de JSON com parser selecionável e cache por versão do arquivo,
+e tabelas de exibição comuns aos mocks.
+"""
+
+import functools
+import json
+import os
+from pathlib import Path
+from typing import Any, Callable
+
+# Ícone exibido por ação de waypoint: ações conhecidas, depois famílias
+# (qualquer ação contendo 'harvest' ou 'turn'), senão DEFAULT_ACTION_ICON
+ACTION_ICON = {
+    'start_harvest': '🌾',
+    'harvest': '🌾',
+    'end_harvest': '🌾',
+    'turn': '🔄',
+    'turn_around': '🔄',
+}
+ACTION_FAMILY_ICON = (
+    ('harvest', '🌾'),
+    ('turn', '🔄'),
+)
+DEFAULT_ACTION_ICON = '📍'
+
+
+@functools.lru_cache(maxsize=None)
+def action_icon(action: str) -> str:
+    """Ícone da ação (ex.: 'resume_harvest' → 🌾, 'turn_left' → 🔄)"""
+    icon = ACTION_ICON.get(action)
+    if icon is not None:
+        return icon
+    for family, icon in ACTION_FAMILY_ICON:
+        if family in action:
+            return icon
+    return DEFAULT_ACTION_ICON
+
+
+# Parser de JSON: auto (orjson se instalado, senão stdlib), json, orjson, ujson ou msgspec
+JSON_PARSER_ENV = 'CANASWARM_JSON_PARSER'
+
+
+def _resolve_json_parser(name: str) -> Callable[[bytes], Any]:
+    """Retorna a função loads(bytes) do parser escolhido"""
+    if name == 'auto':
+        try:
+            import orjson
+            return orjson.loads
+        except ImportError:
+            return json.loads
+    if name == 'json':
+        return json.loads
+    if name == 'orjson':
+        import orjson
+        return orjson.loads
+    if name == 'ujson':
+        import ujson
+        return ujson.loads
+    if name == 'msgspec':
+        import msgspec
+        return msgspec.json.decode
+    raise ValueError(f"Parser JSON desconhecido em {JSON_PARSER_ENV}: {name}")
+
+
+_json_loads = _resolve_json_parser(os.environ.get(JSON_PARSER_ENV, 'auto'))
+
+
+@functools.lru_cache(maxsize=32)
+def _load_json_cached(path: str, mtime_ns: int, size: int) -> Any:
+    """Faz o parse uma vez por versão do arquivo (path, mtime, tamanho)"""
+    return _json_loads(Path(path).read_bytes())
+
+
+def load_json(path) -> Any:
+    """
+    Carrega um arquivo JSON
+
+    O parse é reaproveitado enquanto o arquivo não mudar, e chamadas
+    repetidas recebem o mesmo objeto: trate o retorno como somente leitura
+    e copie o trecho que precisar alterar.
+
+    Args:
+        path: Caminho do arquivo (str ou Path)
+
+    Returns:
+        Conteúdo do arquivo
+    """
+    st = os.stat(path)
+    return _load_json_cached(os.fspath(path), st.st_mtime_ns, st.st_size)
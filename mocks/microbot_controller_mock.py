@@ -5,40 +5,109 @@ CanaSwarm-MicroBot - MicroBot Controller Mock
 Controlador principal do robô autônomo de colheita
 """
 
-import json
+import asyncio
+import shutil
+import struct
+import sys
 import time
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, Iterator, List
 from datetime import datetime
 
+import msgpack
+
+from cana_utils import action_icon, load_json
+
+
+# Ações que enchem o hopper
+_HARVEST_ACTIONS = frozenset({'harvest', 'start_harvest'})
+
+# Log de telemetria: frames msgpack prefixados pelo tamanho (uint32 little-endian)
+_FRAME_HEADER = struct.Struct('<I')
+
+
+def read_telemetry_log(filepath) -> Iterator[Dict]:
+    """
+    Lê um log de telemetria (.mpack) frame a frame
+    
+    O primeiro frame é o cabeçalho (robot_id, mission_id, command_id), os
+    seguintes são registros de telemetria e, após save_telemetry, o último
+    traz 'final_status'. Um frame final incompleto (execução interrompida
+    no meio da escrita) é ignorado.
+    """
+    with open(filepath, 'rb') as f:
+        while len(header := f.read(_FRAME_HEADER.size)) == _FRAME_HEADER.size:
+            (size,) = _FRAME_HEADER.unpack(header)
+            payload = f.read(size)
+            if len(payload) < size:
+                return
+            yield msgpack.unpackb(payload)
+
 
 class MicrobotController:
     """Controlador principal de um MicroBot individual"""
     
-    def __init__(self, robot_id: str):
+    def __init__(self, robot_id: str, telemetry_dir: str = None,
+                 verbose: bool = True, sim_speed: float = 0.0):
         self.robot_id = robot_id
+        self.verbose = verbose
+        self.sim_speed = sim_speed  # Segundos simulados por waypoint (0 = sem espera)
         self.status = "idle"
         self.current_mission = None
         self.current_position = None
-        self.fuel_level_percent = 100
+        self._fuel_permille = 1000  # Ponto fixo: 1 unidade = 0.1%
         self.battery_voltage_v = 24.5
-        self.hopper_fill_percent = 0
+        self._hopper_permille = 0
         self.harvest_rate_kg_min = 0
-        self.telemetry_history = []
+        
+        # Log de telemetria em disco, aberto no primeiro registro
+        self.telemetry_dir = Path(telemetry_dir) if telemetry_dir else Path(__file__).parent
+        self._tele_path = None
+        self._tele_file = None
+        self._tele_n = 0
+    
+    @property
+    def fuel_level_percent(self) -> float:
+        return self._fuel_permille / 10
+    
+    @fuel_level_percent.setter
+    def fuel_level_percent(self, value: float):
+        self._fuel_permille = round(value * 10)
+    
+    @property
+    def hopper_fill_percent(self) -> float:
+        return self._hopper_permille / 10
+    
+    @hopper_fill_percent.setter
+    def hopper_fill_percent(self, value: float):
+        self._hopper_permille = round(value * 10)
+    
+    @property
+    def telemetry_history(self) -> List[Dict]:
+        """Registros de telemetria do log atual, lidos de volta do disco"""
+        if self._tele_path is None:
+            return []
+        if self._tele_file is not None:
+            self._tele_file.flush()
+        return [frame for frame in read_telemetry_log(self._tele_path)
+                if 'timestamp_ns' in frame]
     
     def load_command(self, filepath: str) -> Dict:
         """Carrega comando de missão do CanaSwarm-Core"""
         print(f"🤖 {self.robot_id} - Carregando comando: {filepath}")
         
-        with open(filepath, 'r', encoding='utf-8') as f:
-            command = json.load(f)
+        command = load_json(filepath)
         
         # Valida se o comando é para este robô
         if command['robot_id'] != self.robot_id:
             raise ValueError(f"Comando destinado a {command['robot_id']}, não a {self.robot_id}")
         
+        # Nova missão, novo log: arquiva o da missão anterior, se houver
+        self._rotate_telemetry_log()
+        
         self.current_mission = command
-        self.current_position = command['navigation_plan']['start_position']
+        # Cópia própria: o comando vem do cache de load_json, compartilhado
+        self.current_position = dict(command['navigation_plan']['start_position'])
         
         print(f"✅ Comando carregado: {command['command_id']}")
         print(f"   Missão: {command['mission_id']}")
@@ -67,7 +136,7 @@ class MicrobotController:
         
         return issues
     
-    def execute_mission(self):
+    async def execute_mission(self):
         """Executa missão completa"""
         if not self.current_mission:
             print("❌ Nenhuma missão carregada")
@@ -103,7 +172,8 @@ class MicrobotController:
         
         for i, wp in enumerate(waypoints, 1):
             self._execute_waypoint(wp, i, len(waypoints))
-            time.sleep(0.5)  # Simula tempo de navegação
+            if self.sim_speed > 0:
+                await asyncio.sleep(self.sim_speed)  # Simula tempo de navegação
         
         # Finalização
         self.status = "mission_completed"
@@ -120,30 +190,64 @@ class MicrobotController:
         }
         
         # Simula consumo de combustível (0.5% por waypoint)
-        self.fuel_level_percent -= 0.5
+        self._fuel_permille = max(0, self._fuel_permille - 5)
         
-        # Simula enchimento de hopper durante colheita
-        if waypoint['action'] in ['harvest', 'start_harvest']:
-            self.hopper_fill_percent += 15
+        # Simula enchimento de hopper durante colheita (até 100%)
+        action = waypoint['action']
+        if action in _HARVEST_ACTIONS:
+            self._hopper_permille = min(1000, self._hopper_permille + 150)
             self.harvest_rate_kg_min = 180
-        elif waypoint['action'] == 'end_harvest':
+        elif action == 'end_harvest':
             self.harvest_rate_kg_min = 0
         
-        # Status
-        action_icon = "🌾" if 'harvest' in waypoint['action'] else "🔄" if 'turn' in waypoint['action'] else "📍"
-        
-        print(f"   {action_icon} [{current}/{total}] WP {waypoint['waypoint_id']}: {waypoint['action']}")
-        print(f"      Posição: ({waypoint['lat']:.4f}, {waypoint['lon']:.4f})")
-        print(f"      Velocidade: {waypoint['velocity_m_s']} m/s")
-        print(f"      Combustível: {self.fuel_level_percent:.1f}% | Hopper: {self.hopper_fill_percent:.1f}%")
+        # Status (uma única escrita por waypoint)
+        if self.verbose:
+            icon = action_icon(action)
+            
+            sys.stdout.write(
+                f"   {icon} [{current}/{total}] WP {waypoint['waypoint_id']}: {action}\n"
+                f"      Posição: ({waypoint['lat']:.4f}, {waypoint['lon']:.4f})\n"
+                f"      Velocidade: {waypoint['velocity_m_s']} m/s\n"
+                f"      Combustível: {self.fuel_level_percent:.1f}% | Hopper: {self.hopper_fill_percent:.1f}%\n"
+            )
+            sys.stdout.flush()
         
         # Registra telemetria
         self._record_telemetry(waypoint)
     
+    def _write_frame(self, frame: Dict):
+        payload = msgpack.packb(frame)
+        self._tele_file.write(_FRAME_HEADER.pack(len(payload)))
+        self._tele_file.write(payload)
+    
+    def _open_telemetry_log(self):
+        """Abre um novo log de telemetria e grava o cabeçalho"""
+        mission = self.current_mission or {}
+        # Já nasce com o nome final e exclusivo desta instância
+        self._tele_path, self._tele_file = self._create_log_file(self.telemetry_dir)
+        self._tele_n = 0
+        self._write_frame({
+            'robot_id': self.robot_id,
+            'mission_id': mission.get('mission_id'),
+            'command_id': mission.get('command_id')
+        })
+    
+    def _rotate_telemetry_log(self):
+        """Fecha o log aberto (sem final_status), que fica no próprio arquivo"""
+        if self._tele_file is None:
+            return
+        self._tele_file.close()
+        self._tele_file = None
+        self._tele_path = None
+        self._tele_n = 0
+    
     def _record_telemetry(self, waypoint: Dict):
-        """Registra telemetria atual"""
-        telemetry = {
-            'timestamp': datetime.now().isoformat(),
+        """Registra telemetria atual (append no log em disco)"""
+        if self._tele_file is None:
+            self._open_telemetry_log()
+        
+        self._write_frame({
+            'timestamp_ns': time.time_ns(),
             'position': self.current_position,
             'velocity_m_s': waypoint['velocity_m_s'],
             'fuel_level_percent': self.fuel_level_percent,
@@ -151,8 +255,8 @@ class MicrobotController:
             'hopper_fill_percent': self.hopper_fill_percent,
             'harvest_rate_kg_min': self.harvest_rate_kg_min,
             'status': self.status
-        }
-        self.telemetry_history.append(telemetry)
+        })
+        self._tele_n += 1
     
     def _generate_mission_report(self):
         """Gera relatório de missão"""
@@ -174,39 +278,67 @@ class MicrobotController:
         print(f"   Hopper final: {self.hopper_fill_percent:.1f}%")
         
         print(f"\n📡 TELEMETRIA:")
-        print(f"   Registros coletados: {len(self.telemetry_history)}")
+        print(f"   Registros coletados: {self._tele_n}")
         print(f"   Waypoints navegados: {len(self.current_mission['navigation_plan']['waypoints'])}")
     
+    def _create_log_file(self, output_dir: Path):
+        """
+        Cria um arquivo de log novo, exclusivo desta instância
+        
+        O nome é reservado com 'xb', então nunca sobrescreve nem compartilha
+        o arquivo de outro controlador rodando no mesmo diretório.
+        
+        Returns:
+            (caminho, arquivo aberto para escrita)
+        """
+        stem = f"telemetry_{self.robot_id}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        filepath = output_dir / f"{stem}.mpack"
+        counter = 1
+        while True:
+            try:
+                return filepath, open(filepath, 'xb', buffering=64 * 1024)
+            except FileExistsError:
+                filepath = output_dir / f"{stem}_{counter}.mpack"
+                counter += 1
+    
     def save_telemetry(self, output_dir: str = None):
-        """Salva telemetria em arquivo"""
+        """Fecha o log de telemetria (movendo-o se output_dir for outro diretório)"""
         if output_dir is None:
-            output_dir = Path(__file__).parent
+            output_dir = self.telemetry_dir
         else:
             output_dir = Path(output_dir)
         
-        filename = f"telemetry_{self.robot_id}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-        filepath = output_dir / filename
+        if self._tele_file is None:
+            self._open_telemetry_log()
         
-        data = {
-            'robot_id': self.robot_id,
-            'mission_id': self.current_mission['mission_id'],
-            'command_id': self.current_mission['command_id'],
-            'telemetry': self.telemetry_history,
+        self._write_frame({
             'final_status': {
                 'fuel_level_percent': self.fuel_level_percent,
                 'battery_voltage_v': self.battery_voltage_v,
                 'hopper_fill_percent': self.hopper_fill_percent,
                 'status': self.status
             }
-        }
+        })
+        self._tele_file.close()
+        self._tele_file = None
         
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        filepath = self._tele_path
+        if output_dir.resolve() != filepath.parent.resolve():
+            # Reserva o nome no destino e o substitui pelo nosso próprio log
+            filepath, placeholder = self._create_log_file(output_dir)
+            placeholder.close()
+            shutil.move(self._tele_path, filepath)
+            self._tele_path = filepath
         
-        print(f"\n💾 Telemetria salva em: {filename}")
+        print(f"\n💾 Telemetria salva em: {filepath.name}")
         return str(filepath)
 
 
+async def run_swarm(robots: List[MicrobotController]):
+    """Executa as missões de vários robôs concorrentemente"""
+    await asyncio.gather(*(robot.execute_mission() for robot in robots))
+
+
 if __name__ == "__main__":
     print("🤖 CanaSwarm-MicroBot - Controlador Mock\n")
     print("="*70)
@@ -219,7 +351,7 @@ if __name__ == "__main__":
     robot.load_command(str(command_file))
     
     # Executa missão
-    robot.execute_mission()
+    asyncio.run(robot.execute_mission())
     
     # Salva telemetria
     robot.save_telemetry()
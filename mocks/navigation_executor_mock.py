@@ -6,7 +6,90 @@ Executa navegação usando waypoints com controle de velocidade e ações
 """
 
 import math
-from typing import Dict, Tuple, List
+import sys
+from dataclasses import dataclass, field
+from functools import cached_property
+from typing import Dict, Iterator, Optional, Tuple, List
+
+import numpy as np
+
+from cana_utils import action_icon, load_json
+from geo_kernels import (equirect_bearing, equirect_bearing_batch,
+                         equirect_distance, equirect_distance_batch, warmup)
+
+
+@dataclass(frozen=True)
+class NavResult:
+    """Resultado da navegação até um waypoint (bearing calculado sob demanda)"""
+    
+    waypoint_id: str
+    distance_m: float
+    target_velocity_m_s: float
+    estimated_time_s: float
+    action: str
+    arrival_lat: float
+    arrival_lon: float
+    start_lat: float = field(repr=False)
+    start_lon: float = field(repr=False)
+    cos_lat_ref: float = field(repr=False)
+    precomputed_bearing_deg: Optional[float] = field(default=None, repr=False)
+    
+    @cached_property
+    def bearing_deg(self) -> float:
+        if self.precomputed_bearing_deg is not None:
+            return self.precomputed_bearing_deg
+        return equirect_bearing(self.start_lat, self.start_lon,
+                                self.arrival_lat, self.arrival_lon, self.cos_lat_ref)
+
+
+@dataclass
+class NavigationResults:
+    """Resultados de navegação em colunas (struct-of-arrays)"""
+    
+    waypoint_ids: List[str] = field(default_factory=list)
+    actions: List[str] = field(default_factory=list)
+    distance_m: np.ndarray = field(default_factory=lambda: np.empty(0))
+    target_velocity_m_s: np.ndarray = field(default_factory=lambda: np.empty(0))
+    estimated_time_s: np.ndarray = field(default_factory=lambda: np.empty(0))
+    lats: np.ndarray = field(default_factory=lambda: np.empty(0))  # Início + waypoints
+    lons: np.ndarray = field(default_factory=lambda: np.empty(0))
+    cos_lat_ref: float = 1.0
+    bearing_deg: Optional[np.ndarray] = None  # None se compute_bearing=False
+    
+    @property
+    def arrival_lat(self) -> np.ndarray:
+        return self.lats[1:]
+    
+    @property
+    def arrival_lon(self) -> np.ndarray:
+        return self.lons[1:]
+    
+    def __len__(self) -> int:
+        return len(self.waypoint_ids)
+    
+    def __getitem__(self, i: int) -> NavResult:
+        """Materializa um segmento (mesmo formato de navigate_to_waypoint)"""
+        n = len(self)
+        if not -n <= i < n:
+            raise IndexError("Segmento fora do intervalo")
+        i %= n
+        return NavResult(
+            self.waypoint_ids[i],
+            float(self.distance_m[i]),
+            float(self.target_velocity_m_s[i]),
+            float(self.estimated_time_s[i]),
+            self.actions[i],
+            float(self.lats[i + 1]),
+            float(self.lons[i + 1]),
+            float(self.lats[i]),
+            float(self.lons[i]),
+            self.cos_lat_ref,
+            None if self.bearing_deg is None else float(self.bearing_deg[i])
+        )
+    
+    def __iter__(self) -> Iterator[NavResult]:
+        for i in range(len(self)):
+            yield self[i]
 
 
 class NavigationExecutor:
@@ -15,13 +98,56 @@ class NavigationExecutor:
     def __init__(self, robot_id: str):
         self.robot_id = robot_id
         self.current_position = None
-        self.current_heading_deg = 0
+        self._heading_deg = 0
+        self._last_result = None  # Heading vem do último segmento, sob demanda
         self.current_velocity_m_s = 0
         self.total_distance_m = 0
+        
+        # Latitude de referência da missão (projeção equirretangular)
+        self._lat_ref_rad = None
+        self._cos_lat_ref = None
+        
+        # Compila os kernels antes da missão começar
+        warmup()
+    
+    @property
+    def current_heading_deg(self) -> float:
+        if self._last_result is not None:
+            return self._last_result.bearing_deg
+        return self._heading_deg
+    
+    @current_heading_deg.setter
+    def current_heading_deg(self, value: float):
+        self._heading_deg = value
+        self._last_result = None
+    
+    def set_reference_latitude(self, lat_deg: Optional[float]):
+        """
+        Define a latitude de referência usada nos cálculos da missão
+        
+        Com None a referência é removida e cada segmento usa sua própria
+        latitude média.
+        """
+        if lat_deg is None:
+            self._lat_ref_rad = None
+            self._cos_lat_ref = None
+        else:
+            self._lat_ref_rad = math.radians(lat_deg)
+            self._cos_lat_ref = math.cos(self._lat_ref_rad)
+    
+    def _segment_cos_lat(self, pos1: Dict, pos2: Dict) -> float:
+        """Cosseno da referência da missão, ou da latitude média do segmento"""
+        if self._cos_lat_ref is not None:
+            return self._cos_lat_ref
+        return math.cos(math.radians((pos1['lat'] + pos2['lat']) / 2))
     
     def calculate_distance(self, pos1: Dict, pos2: Dict) -> float:
         """
-        Calcula distância entre dois pontos GPS usando fórmula de Haversine
+        Calcula distância entre dois pontos GPS (aproximação equirretangular)
+        
+        Usa o cosseno da latitude de referência da missão (ou, sem missão,
+        da latitude média do segmento); em talhões de poucos km o erro em
+        relação a Haversine fica abaixo do ruído do GPS RTK.
         
         Args:
             pos1: {'lat': float, 'lon': float}
@@ -30,20 +156,8 @@ class NavigationExecutor:
         Returns:
             Distância em metros
         """
-        R = 6371000  # Raio da Terra em metros
-        
-        lat1 = math.radians(pos1['lat'])
-        lat2 = math.radians(pos2['lat'])
-        delta_lat = math.radians(pos2['lat'] - pos1['lat'])
-        delta_lon = math.radians(pos2['lon'] - pos1['lon'])
-        
-        a = (math.sin(delta_lat / 2) ** 2 +
-             math.cos(lat1) * math.cos(lat2) *
-             math.sin(delta_lon / 2) ** 2)
-        c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
-        
-        distance = R * c
-        return distance
+        return equirect_distance(pos1['lat'], pos1['lon'], pos2['lat'], pos2['lon'],
+                                 self._segment_cos_lat(pos1, pos2))
     
     def calculate_bearing(self, pos1: Dict, pos2: Dict) -> float:
         """
@@ -56,21 +170,10 @@ class NavigationExecutor:
         Returns:
             Bearing em graus (0-360, onde 0=Norte, 90=Leste)
         """
-        lat1 = math.radians(pos1['lat'])
-        lat2 = math.radians(pos2['lat'])
-        delta_lon = math.radians(pos2['lon'] - pos1['lon'])
-        
-        x = math.sin(delta_lon) * math.cos(lat2)
-        y = (math.cos(lat1) * math.sin(lat2) -
-             math.sin(lat1) * math.cos(lat2) * math.cos(delta_lon))
-        
-        bearing = math.atan2(x, y)
-        bearing_deg = math.degrees(bearing)
-        bearing_deg = (bearing_deg + 360) % 360
-        
-        return bearing_deg
+        return equirect_bearing(pos1['lat'], pos1['lon'], pos2['lat'], pos2['lon'],
+                                self._segment_cos_lat(pos1, pos2))
     
-    def navigate_to_waypoint(self, waypoint: Dict, start_pos: Dict = None) -> Dict:
+    def navigate_to_waypoint(self, waypoint: Dict, start_pos: Dict = None) -> NavResult:
         """
         Navega para um waypoint
         
@@ -87,77 +190,131 @@ class NavigationExecutor:
         if start_pos is None:
             raise ValueError("Posição inicial não definida")
         
-        # Calcula distância e bearing
+        # Calcula distância (bearing só quando lido)
+        cos_lat = self._segment_cos_lat(start_pos, waypoint)
         distance_m = self.calculate_distance(start_pos, waypoint)
-        bearing_deg = self.calculate_bearing(start_pos, waypoint)
         
         # Calcula tempo estimado
         target_velocity = waypoint.get('velocity_m_s', 1.0)
         time_seconds = distance_m / target_velocity if target_velocity > 0 else 0
         
-        # Atualiza estado
-        self.current_position = waypoint
-        self.current_heading_deg = bearing_deg
+        # Atualiza estado (copia só lat/lon, sem reter o dict do chamador)
+        arrival_lat = waypoint['lat']
+        arrival_lon = waypoint['lon']
+        result = NavResult(
+            waypoint.get('waypoint_id', 'unknown'),
+            distance_m,
+            target_velocity,
+            time_seconds,
+            waypoint.get('action', 'navigate'),
+            arrival_lat,
+            arrival_lon,
+            start_pos['lat'],
+            start_pos['lon'],
+            cos_lat
+        )
+        
+        self.current_position = {'lat': arrival_lat, 'lon': arrival_lon}
+        self._last_result = result
         self.current_velocity_m_s = target_velocity
         self.total_distance_m += distance_m
         
-        return {
-            'waypoint_id': waypoint.get('waypoint_id', 'unknown'),
-            'distance_m': distance_m,
-            'bearing_deg': bearing_deg,
-            'target_velocity_m_s': target_velocity,
-            'estimated_time_s': time_seconds,
-            'action': waypoint.get('action', 'navigate'),
-            'arrival_position': self.current_position
-        }
-    
-    def execute_navigation_plan(self, navigation_plan: Dict) -> List[Dict]:
+        return result
+    
+    def execute_navigation_plan(self, navigation_plan: Dict,
+                                compute_bearing: bool = True) -> NavigationResults:
         """
         Executa plano de navegação completo
         
         Args:
             navigation_plan: Plano com start_position e waypoints
+            compute_bearing: Se False, pula o cálculo em lote dos bearings
+                (execuções headless); cada segmento ainda calcula o seu sob demanda
         
         Returns:
-            Lista de resultados de cada segmento
+            Resultados de cada segmento, em colunas
         """
+        start = navigation_plan['start_position']
+        waypoints = navigation_plan['waypoints']
+        
         # Define posição inicial
-        self.current_position = navigation_plan['start_position']
-        self.current_heading_deg = navigation_plan['start_position'].get('heading_deg', 0)
+        self.current_position = {'lat': start['lat'], 'lon': start['lon']}
+        self.current_heading_deg = start.get('heading_deg', 0)
         self.total_distance_m = 0
+        self.set_reference_latitude(start['lat'])
+        
+        if not waypoints:
+            return NavigationResults()
+        
+        # Vetores (lat, lon) de todos os pontos: início + waypoints
+        n = len(waypoints) + 1
+        lats = np.fromiter((p['lat'] for p in [start, *waypoints]),
+                           dtype=np.float64, count=n)
+        lons = np.fromiter((p['lon'] for p in [start, *waypoints]),
+                           dtype=np.float64, count=n)
         
-        results = []
+        # Distância (e bearing) de todos os segmentos em uma única chamada
+        if compute_bearing:
+            distances, bearings = equirect_bearing_batch(lats, lons, self._cos_lat_ref)
+        else:
+            distances = equirect_distance_batch(lats, lons, self._cos_lat_ref)
+            bearings = None
         
-        for waypoint in navigation_plan['waypoints']:
-            result = self.navigate_to_waypoint(waypoint)
-            results.append(result)
+        velocities = np.fromiter(
+            (wp.get('velocity_m_s', 1.0) for wp in waypoints),
+            dtype=np.float64, count=n - 1)
+        times = np.divide(distances, velocities,
+                          out=np.zeros_like(distances), where=velocities > 0)
+        
+        results = NavigationResults(
+            waypoint_ids=[wp.get('waypoint_id', 'unknown') for wp in waypoints],
+            actions=[wp.get('action', 'navigate') for wp in waypoints],
+            distance_m=distances,
+            target_velocity_m_s=velocities,
+            estimated_time_s=times,
+            lats=lats,
+            lons=lons,
+            cos_lat_ref=self._cos_lat_ref,
+            bearing_deg=bearings
+        )
+        
+        # Atualiza estado com o último segmento
+        self.current_position = {'lat': waypoints[-1]['lat'], 'lon': waypoints[-1]['lon']}
+        self._last_result = results[-1]
+        self.current_velocity_m_s = waypoints[-1].get('velocity_m_s', 1.0)
+        self.total_distance_m = float(distances.sum())
         
         return results
     
-    def display_navigation_summary(self, results: List[Dict]):
+    def display_navigation_summary(self, results: NavigationResults):
         """Exibe resumo da navegação"""
-        print("\n" + "="*70)
-        print("🗺️  RESUMO DE NAVEGAÇÃO")
-        print("="*70)
-        
-        print(f"\n📍 WAYPOINTS NAVEGADOS: {len(results)}")
+        total_distance = results.distance_m.sum()
+        total_time = results.estimated_time_s.sum()
         
-        total_distance = sum(r['distance_m'] for r in results)
-        total_time = sum(r['estimated_time_s'] for r in results)
+        lines = [
+            "",
+            "="*70,
+            "🗺️  RESUMO DE NAVEGAÇÃO",
+            "="*70,
+            f"\n📍 WAYPOINTS NAVEGADOS: {len(results)}"
+        ]
         
-        for i, result in enumerate(results, 1):
-            action_icon = "🌾" if 'harvest' in result['action'] else "🔄" if 'turn' in result['action'] else "📍"
+        for i, r in enumerate(results, 1):
+            icon = action_icon(r.action)
             
-            print(f"\n{action_icon} {i}. {result['waypoint_id']} - {result['action'].upper()}")
-            print(f"   Distância: {result['distance_m']:.1f}m")
-            print(f"   Bearing: {result['bearing_deg']:.1f}°")
-            print(f"   Velocidade: {result['target_velocity_m_s']:.1f} m/s")
-            print(f"   Tempo: {result['estimated_time_s']:.1f}s")
-        
-        print(f"\n📊 TOTAIS:")
-        print(f"   Distância total: {total_distance:.1f}m")
-        print(f"   Tempo total: {total_time/60:.1f} minutos")
-        print(f"   Velocidade média: {total_distance/total_time:.2f} m/s")
+            lines.append(f"\n{icon} {i}. {r.waypoint_id} - {r.action.upper()}")
+            lines.append(f"   Distância: {r.distance_m:.1f}m")
+            lines.append(f"   Bearing: {r.bearing_deg:.1f}°")
+            lines.append(f"   Velocidade: {r.target_velocity_m_s:.1f} m/s")
+            lines.append(f"   Tempo: {r.estimated_time_s:.1f}s")
+        
+        lines.append(f"\n📊 TOTAIS:")
+        lines.append(f"   Distância total: {total_distance:.1f}m")
+        lines.append(f"   Tempo total: {total_time/60:.1f} minutos")
+        lines.append(f"   Velocidade média: {total_distance/total_time:.2f} m/s")
+        
+        sys.stdout.write("\n".join(lines) + "\n")
+        sys.stdout.flush()
 
 
 if __name__ == "__main__":
@@ -168,12 +325,10 @@ if __name__ == "__main__":
     navigator = NavigationExecutor("MICROBOT-001")
     
     # Carrega plano de navegação de exemplo
-    import json
     from pathlib import Path
     
     command_file = Path(__file__).parent / "example_robot_commands.json"
-    with open(command_file, 'r', encoding='utf-8') as f:
-        command = json.load(f)
+    command = load_json(command_file)
     
     navigation_plan = command['navigation_plan']
     
@@ -5,9 +5,191 @@ CanaSwarm-MicroBot - Sensor Manager Mock
 Gerencia sensores do robô (GPS, IMU, LIDAR, câmeras, etc)
 """
 
-import random
+import time
+from dataclasses import dataclass
 from datetime import datetime
-from typing import Dict, List
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+
+# Faixas (mín, máx) de cada valor aleatório lido por ciclo, na ordem
+# em que os _fill_* consomem o vetor. Inteiros usam piso de [mín, máx).
+_GPS_BOUNDS = [
+    (-0.000005, 0.000005),  # Ruído lat (~0.5m)
+    (-0.000005, 0.000005),  # Ruído lon
+    (548, 552),             # Altitude (m)
+    (10, 15),               # Satélites (int)
+]
+_IMU_BOUNDS = [
+    (-0.5, 0.5), (-0.5, 0.5), (9.71, 9.91),  # Aceleração x, y, z (m/s²)
+    (-2, 2), (-2, 2), (-5, 5),               # Giroscópio roll, pitch, yaw (°/s)
+    (-5, 5), (-5, 5), (85, 95),              # Orientação roll, pitch, yaw (°)
+    (30, 40),                                # Temperatura (°C)
+]
+_LIDAR_MAX_OBSTACLES = 3
+_LIDAR_BOUNDS = [
+    (0, _LIDAR_MAX_OBSTACLES + 1),  # Número de obstáculos (int)
+] + [(5, 50), (0, 360), (0.3, 2.0)] * _LIDAR_MAX_OBSTACLES  # Distância, ângulo, tamanho
+_HARVEST_BOUNDS = [
+    (1150, 1250),  # Lâmina (RPM)
+    (1.4, 1.6),    # Esteira (m/s)
+    (170, 190),    # Taxa de colheita (kg/min)
+    (0.5, 2.0),    # Vibração da lâmina (mm/s)
+    (35, 55),      # Temperatura da lâmina (°C)
+    (50, 90),      # Carga da esteira (%)
+    (0, 100),      # Hopper (%)
+]
+_FUEL_BATTERY_BOUNDS = [
+    (90, 100),     # Combustível (%)
+    (8, 12),       # Consumo (l/h)
+    (24.0, 24.8),  # Tensão da bateria (V)
+    (5, 15),       # Corrente (A)
+    (30, 45),      # Temperatura da bateria (°C)
+]
+
+
+def _slices(*groups):
+    start = 0
+    for group in groups:
+        yield slice(start, start + len(group))
+        start += len(group)
+
+
+_GPS, _IMU, _LIDAR, _HARVEST, _FUEL_BATTERY = _slices(
+    _GPS_BOUNDS, _IMU_BOUNDS, _LIDAR_BOUNDS, _HARVEST_BOUNDS, _FUEL_BATTERY_BOUNDS)
+_TICK_BOUNDS = np.array(
+    _GPS_BOUNDS + _IMU_BOUNDS + _LIDAR_BOUNDS + _HARVEST_BOUNDS + _FUEL_BATTERY_BOUNDS)
+_TICK_LOW = _TICK_BOUNDS[:, 0]
+_TICK_SPAN = _TICK_BOUNDS[:, 1] - _TICK_BOUNDS[:, 0]
+_TICK_SIZE = len(_TICK_BOUNDS)
+
+# Valores fixos de configuração dos sensores
+_GPS_ACCURACY_M = 0.5
+_GPS_FIX_QUALITY = 'rtk'  # Real-Time Kinematic (precisão cm)
+_LIDAR_SCAN_RATE_HZ = 10
+_LIDAR_RANGE_M = 50
+_IDLE_BLADE_TEMPERATURE_C = 25
+_DEFAULT_POSITION = {'lat': -22.7145, 'lon': -47.6489}
+
+# Âncora para converter time.monotonic_ns() em horário de parede (ns Unix)
+_WALL_OFFSET_NS = time.time_ns() - time.monotonic_ns()
+
+
+@dataclass(slots=True)
+class SensorTick:
+    """Leitura de todos os sensores em um ciclo, em um único registro plano"""
+    
+    monotonic_ns: int  # time.monotonic_ns() da coleta
+    robot_id: str
+    # GPS
+    gps_lat: float = 0.0
+    gps_lon: float = 0.0
+    gps_alt_m: float = 0.0
+    gps_sats: int = 0
+    # IMU
+    imu_ax: float = 0.0
+    imu_ay: float = 0.0
+    imu_az: float = 0.0
+    imu_roll_rate: float = 0.0
+    imu_pitch_rate: float = 0.0
+    imu_yaw_rate: float = 0.0
+    imu_roll: float = 0.0
+    imu_pitch: float = 0.0
+    imu_yaw: float = 0.0
+    imu_temp_c: float = 0.0
+    # LIDAR: (distância m, ângulo °, tamanho m) por obstáculo
+    lidar_obstacles: Tuple[Tuple[float, float, float], ...] = ()
+    # Colheita
+    blade_rpm: float = 0.0
+    blade_vibration_mm_s: float = 0.0
+    blade_temp_c: float = 0.0
+    conveyor_speed_m_s: float = 0.0
+    conveyor_load_pct: float = 0.0
+    harvest_rate_kg_min: float = 0.0
+    hopper_pct: float = 0.0
+    # Combustível/Bateria
+    fuel_pct: float = 0.0
+    fuel_rate_l_h: float = 0.0
+    batt_v: float = 0.0
+    batt_a: float = 0.0
+    batt_temp_c: float = 0.0
+    
+    @property
+    def timestamp_ns(self) -> int:
+        """Horário de parede da coleta em ns desde a época Unix"""
+        return self.monotonic_ns + _WALL_OFFSET_NS
+    
+    @property
+    def timestamp_iso(self) -> str:
+        """Horário de parede da coleta em ISO 8601"""
+        return datetime.fromtimestamp(self.timestamp_ns / 1e9).isoformat()
+    
+    def as_dict(self) -> Dict:
+        """Reconstrói a visão hierárquica por sensor (para exibição/exportação)"""
+        return {
+            'timestamp_ns': self.timestamp_ns,
+            'robot_id': self.robot_id,
+            'gps': {
+                'lat': self.gps_lat,
+                'lon': self.gps_lon,
+                'altitude_m': self.gps_alt_m,
+                'accuracy_m': _GPS_ACCURACY_M,
+                'satellites': self.gps_sats,
+                'fix_quality': _GPS_FIX_QUALITY
+            },
+            'imu': {
+                'acceleration': {
+                    'x_m_s2': self.imu_ax,
+                    'y_m_s2': self.imu_ay,
+                    'z_m_s2': self.imu_az
+                },
+                'gyroscope': {
+                    'roll_deg_s': self.imu_roll_rate,
+                    'pitch_deg_s': self.imu_pitch_rate,
+                    'yaw_deg_s': self.imu_yaw_rate
+                },
+                'orientation': {
+                    'roll_deg': self.imu_roll,
+                    'pitch_deg': self.imu_pitch,
+                    'yaw_deg': self.imu_yaw
+                },
+                'temperature_c': self.imu_temp_c
+            },
+            'lidar': {
+                'obstacles_count': len(self.lidar_obstacles),
+                'obstacles': [
+                    {'distance_m': distance, 'angle_deg': angle, 'size_m': size}
+                    for distance, angle, size in self.lidar_obstacles
+                ],
+                'scan_rate_hz': _LIDAR_SCAN_RATE_HZ,
+                'range_m': _LIDAR_RANGE_M
+            },
+            'harvest': {
+                'blade': {
+                    'rpm': self.blade_rpm,
+                    'vibration_mm_s': self.blade_vibration_mm_s,
+                    'temperature_c': self.blade_temp_c
+                },
+                'conveyor': {
+                    'speed_m_s': self.conveyor_speed_m_s,
+                    'load_percent': self.conveyor_load_pct
+                },
+                'harvest_rate_kg_min': self.harvest_rate_kg_min,
+                'hopper_fill_percent': self.hopper_pct
+            },
+            'fuel_battery': {
+                'fuel': {
+                    'level_percent': self.fuel_pct,
+                    'consumption_rate_l_h': self.fuel_rate_l_h
+                },
+                'battery': {
+                    'voltage_v': self.batt_v,
+                    'current_a': self.batt_a,
+                    'temperature_c': self.batt_temp_c
+                }
+            }
+        }
 
 
 class SensorManager:
@@ -16,7 +198,8 @@ class SensorManager:
     def __init__(self, robot_id: str):
         self.robot_id = robot_id
         self.sensors_status = {}
-        self.sensor_readings = []
+        self.sensor_readings: List[SensorTick] = []
+        self._rng = np.random.default_rng()
     
     def initialize_sensors(self) -> Dict:
         """Inicializa todos os sensores"""
@@ -43,175 +226,98 @@ class SensorManager:
         print(f"\n✅ {len(sensors)} sensores inicializados\n")
         return sensors
     
-    def read_gps(self, actual_position: Dict = None) -> Dict:
-        """Lê posição GPS (com ruído simulado)"""
-        if actual_position is None:
-            # Posição padrão se não fornecida
-            actual_position = {'lat': -22.7145, 'lon': -47.6489}
-        
-        # Adiciona ruído GPS (0.5m de precisão)
-        noise_lat = random.uniform(-0.000005, 0.000005)  # ~0.5m
-        noise_lon = random.uniform(-0.000005, 0.000005)
-        
-        reading = {
-            'timestamp': datetime.now().isoformat(),
-            'lat': actual_position['lat'] + noise_lat,
-            'lon': actual_position['lon'] + noise_lon,
-            'altitude_m': 550 + random.uniform(-2, 2),
-            'accuracy_m': 0.5,
-            'satellites': random.randint(10, 14),
-            'fix_quality': 'rtk'  # Real-Time Kinematic (precisão cm)
-        }
-        
-        return reading
-    
-    def read_imu(self) -> Dict:
-        """Lê dados do IMU (acelerômetro, giroscópio, magnetômetro)"""
-        reading = {
-            'timestamp': datetime.now().isoformat(),
-            'acceleration': {
-                'x_m_s2': random.uniform(-0.5, 0.5),
-                'y_m_s2': random.uniform(-0.5, 0.5),
-                'z_m_s2': 9.81 + random.uniform(-0.1, 0.1)
-            },
-            'gyroscope': {
-                'roll_deg_s': random.uniform(-2, 2),
-                'pitch_deg_s': random.uniform(-2, 2),
-                'yaw_deg_s': random.uniform(-5, 5)
-            },
-            'orientation': {
-                'roll_deg': random.uniform(-5, 5),
-                'pitch_deg': random.uniform(-5, 5),
-                'yaw_deg': random.uniform(85, 95)  # ~90° (leste)
-            },
-            'temperature_c': 35 + random.uniform(-5, 5)
-        }
-        
-        return reading
+    def _fill_gps(self, tick: SensorTick, values: List[float], actual_position: Dict):
+        """Preenche GPS (posição real + ruído de ~0.5m)"""
+        noise_lat, noise_lon, tick.gps_alt_m, satellites = values
+        tick.gps_lat = actual_position['lat'] + noise_lat
+        tick.gps_lon = actual_position['lon'] + noise_lon
+        tick.gps_sats = int(satellites)
     
-    def read_lidar(self) -> Dict:
-        """Lê dados do LIDAR (obstáculos)"""
-        # Simula detecção de obstáculos
-        num_obstacles = random.randint(0, 3)
-        obstacles = []
-        
-        for i in range(num_obstacles):
-            obstacles.append({
-                'distance_m': random.uniform(5, 50),
-                'angle_deg': random.uniform(0, 360),
-                'size_m': random.uniform(0.3, 2.0)
-            })
-        
-        reading = {
-            'timestamp': datetime.now().isoformat(),
-            'obstacles_count': num_obstacles,
-            'obstacles': obstacles,
-            'scan_rate_hz': 10,
-            'range_m': 50
-        }
-        
-        return reading
+    def _fill_imu(self, tick: SensorTick, values: List[float]):
+        """Preenche IMU (acelerômetro, giroscópio, orientação)"""
+        (tick.imu_ax, tick.imu_ay, tick.imu_az,
+         tick.imu_roll_rate, tick.imu_pitch_rate, tick.imu_yaw_rate,
+         tick.imu_roll, tick.imu_pitch, tick.imu_yaw,
+         tick.imu_temp_c) = values
+    
+    def _fill_lidar(self, tick: SensorTick, values: List[float]):
+        """Preenche LIDAR (obstáculos)"""
+        num_obstacles = int(values[0])
+        tick.lidar_obstacles = tuple(
+            (values[i], values[i + 1], values[i + 2])
+            for i in range(1, 1 + 3 * num_obstacles, 3)
+        )
     
-    def read_harvest_sensors(self, is_harvesting: bool = False) -> Dict:
-        """Lê sensores de colheita"""
+    def _fill_harvest(self, tick: SensorTick, values: List[float], is_harvesting: bool):
+        """Preenche sensores de colheita (zerados fora da colheita, exceto o hopper)"""
         if is_harvesting:
-            blade_rpm = random.uniform(1150, 1250)
-            conveyor_speed = random.uniform(1.4, 1.6)
-            harvest_rate = random.uniform(170, 190)
+            (tick.blade_rpm, tick.conveyor_speed_m_s, tick.harvest_rate_kg_min,
+             tick.blade_vibration_mm_s, tick.blade_temp_c, tick.conveyor_load_pct,
+             tick.hopper_pct) = values
         else:
-            blade_rpm = 0
-            conveyor_speed = 0
-            harvest_rate = 0
-        
-        reading = {
-            'timestamp': datetime.now().isoformat(),
-            'blade': {
-                'rpm': blade_rpm,
-                'vibration_mm_s': random.uniform(0.5, 2.0) if is_harvesting else 0,
-                'temperature_c': 45 + random.uniform(-10, 10) if is_harvesting else 25
-            },
-            'conveyor': {
-                'speed_m_s': conveyor_speed,
-                'load_percent': random.uniform(50, 90) if is_harvesting else 0
-            },
-            'harvest_rate_kg_min': harvest_rate,
-            'hopper_fill_percent': random.uniform(0, 100)
-        }
-        
-        return reading
-    
-    def read_fuel_battery(self) -> Dict:
-        """Lê níveis de combustível e bateria"""
-        reading = {
-            'timestamp': datetime.now().isoformat(),
-            'fuel': {
-                'level_percent': random.uniform(90, 100),
-                'consumption_rate_l_h': random.uniform(8, 12)
-            },
-            'battery': {
-                'voltage_v': random.uniform(24.0, 24.8),
-                'current_a': random.uniform(5, 15),
-                'temperature_c': random.uniform(30, 45)
-            }
-        }
-        
-        return reading
+            tick.blade_temp_c = _IDLE_BLADE_TEMPERATURE_C
+            tick.hopper_pct = values[-1]
+    
+    def _fill_fuel_battery(self, tick: SensorTick, values: List[float]):
+        """Preenche combustível e bateria"""
+        (tick.fuel_pct, tick.fuel_rate_l_h,
+         tick.batt_v, tick.batt_a, tick.batt_temp_c) = values
     
-    def collect_all_sensors(self, actual_position: Dict = None, is_harvesting: bool = False) -> Dict:
+    def collect_all_sensors(self, actual_position: Dict = None,
+                            is_harvesting: bool = False) -> SensorTick:
         """Coleta leitura de todos os sensores"""
-        reading = {
-            'timestamp': datetime.now().isoformat(),
-            'robot_id': self.robot_id,
-            'gps': self.read_gps(actual_position),
-            'imu': self.read_imu(),
-            'lidar': self.read_lidar(),
-            'harvest': self.read_harvest_sensors(is_harvesting),
-            'fuel_battery': self.read_fuel_battery()
-        }
+        if actual_position is None:
+            # Posição padrão se não fornecida
+            actual_position = _DEFAULT_POSITION
+        
+        # Um único timestamp e um único sorteio para todas as leituras do ciclo
+        tick = SensorTick(time.monotonic_ns(), self.robot_id)
+        values = (_TICK_LOW + _TICK_SPAN * self._rng.random(_TICK_SIZE)).tolist()
+        
+        self._fill_gps(tick, values[_GPS], actual_position)
+        self._fill_imu(tick, values[_IMU])
+        self._fill_lidar(tick, values[_LIDAR])
+        self._fill_harvest(tick, values[_HARVEST], is_harvesting)
+        self._fill_fuel_battery(tick, values[_FUEL_BATTERY])
         
-        self.sensor_readings.append(reading)
-        return reading
+        self.sensor_readings.append(tick)
+        return tick
     
-    def display_sensor_reading(self, reading: Dict):
+    def display_sensor_reading(self, reading: SensorTick):
         """Exibe leitura de sensores em formato dashboard"""
         print("\n" + "="*70)
         print("📡 LEITURA DE SENSORES")
         print("="*70)
+        print(f"   Timestamp: {reading.timestamp_iso}")
         
         # GPS
-        gps = reading['gps']
         print(f"\n📍 GPS:")
-        print(f"   Posição: ({gps['lat']:.6f}, {gps['lon']:.6f})")
-        print(f"   Altitude: {gps['altitude_m']:.1f}m")
-        print(f"   Precisão: {gps['accuracy_m']}m ({gps['satellites']} satélites)")
+        print(f"   Posição: ({reading.gps_lat:.6f}, {reading.gps_lon:.6f})")
+        print(f"   Altitude: {reading.gps_alt_m:.1f}m")
+        print(f"   Precisão: {_GPS_ACCURACY_M}m ({reading.gps_sats} satélites)")
         
         # IMU
-        imu = reading['imu']
         print(f"\n🧭 IMU:")
-        print(f"   Orientação: Roll {imu['orientation']['roll_deg']:.1f}° | Pitch {imu['orientation']['pitch_deg']:.1f}° | Yaw {imu['orientation']['yaw_deg']:.1f}°")
-        print(f"   Aceleração Z: {imu['acceleration']['z_m_s2']:.2f} m/s²")
+        print(f"   Orientação: Roll {reading.imu_roll:.1f}° | Pitch {reading.imu_pitch:.1f}° | Yaw {reading.imu_yaw:.1f}°")
+        print(f"   Aceleração Z: {reading.imu_az:.2f} m/s²")
         
         # LIDAR
-        lidar = reading['lidar']
         print(f"\n🔍 LIDAR:")
-        print(f"   Obstáculos detectados: {lidar['obstacles_count']}")
-        if lidar['obstacles']:
-            for i, obs in enumerate(lidar['obstacles'], 1):
-                print(f"      {i}. Distância: {obs['distance_m']:.1f}m | Ângulo: {obs['angle_deg']:.0f}°")
+        print(f"   Obstáculos detectados: {len(reading.lidar_obstacles)}")
+        for i, (distance, angle, _size) in enumerate(reading.lidar_obstacles, 1):
+            print(f"      {i}. Distância: {distance:.1f}m | Ângulo: {angle:.0f}°")
         
         # Colheita
-        harvest = reading['harvest']
         print(f"\n🌾 COLHEITA:")
-        print(f"   Lâmina: {harvest['blade']['rpm']:.0f} RPM")
-        print(f"   Esteira: {harvest['conveyor']['speed_m_s']:.1f} m/s")
-        print(f"   Taxa de colheita: {harvest['harvest_rate_kg_min']:.0f} kg/min")
-        print(f"   Hopper: {harvest['hopper_fill_percent']:.1f}%")
+        print(f"   Lâmina: {reading.blade_rpm:.0f} RPM")
+        print(f"   Esteira: {reading.conveyor_speed_m_s:.1f} m/s")
+        print(f"   Taxa de colheita: {reading.harvest_rate_kg_min:.0f} kg/min")
+        print(f"   Hopper: {reading.hopper_pct:.1f}%")
         
         # Combustível/Bateria
-        fb = reading['fuel_battery']
         print(f"\n🔋 ENERGIA:")
-        print(f"   Combustível: {fb['fuel']['level_percent']:.1f}%")
-        print(f"   Bateria: {fb['battery']['voltage_v']:.1f}V")
+        print(f"   Combustível: {reading.fuel_pct:.1f}%")
+        print(f"   Bateria: {reading.batt_v:.1f}V")
 
 
 if __name__ == "__main__":